@@ -2,36 +2,61 @@ from __future__ import annotations
 
 import os
 import sys
+import atexit
 import logging
+import logging.handlers
+import queue
 import shlex
+import socket
 import subprocess
 import threading
 import time
 import winreg
-import webbrowser
 import json
 import io
-import base64
+import binascii
 import tempfile
 import asyncio
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Optional
 
 import pystray
+import PIL
 from PIL import Image
 
-# MCP-related imports with error handling
-MCP_AVAILABLE = False
-try:
+# MCP dependencies are only probed here; _import_mcp() loads them when the
+# MCP server is first started, so the tray doesn't pay for them at startup
+MCP_AVAILABLE = all(
+    importlib.util.find_spec(name) is not None
+    for name in ("mcp", "uvicorn", "starlette")
+)
+
+def _import_mcp() -> None:
+    """Import the MCP server stack into module globals (idempotent)"""
+    global uvicorn, Server, SseServerTransport, Tool, TextContent, ImageContent, EmbeddedResource
+    global Starlette, Response, Route
     import uvicorn
     from mcp.server import Server
     from mcp.server.sse import SseServerTransport
     from mcp.types import Tool, TextContent, ImageContent, EmbeddedResource
     from starlette.applications import Starlette
+    from starlette.responses import Response
     from starlette.routing import Route
-    MCP_AVAILABLE = True
-except ImportError as e:
-    logging.warning("MCP dependencies not available: %s. MCP server functionality will be disabled.", e)
+
+# SIMD base64 encoder, with stdlib fallback
+try:
+    from pybase64 import b64encode_as_string as _b64encode
+except ImportError:
+    def _b64encode(data: bytes) -> str:
+        return binascii.b2a_base64(data, newline=False).decode('ascii')
+
+# Fast hash of raw frame pixels for change detection, with zlib fallback
+try:
+    from xxhash import xxh3_64_intdigest as _frame_hash
+except ImportError:
+    from zlib import crc32 as _frame_hash
 
 # ─── Constants ────────────────────────────────────────────────────────────────
 
@@ -39,18 +64,66 @@ APP_NAME = "uxplay-windows"
 APPDATA_DIR = Path(os.environ["APPDATA"]) / "uxplay-windows"
 LOG_FILE = APPDATA_DIR / f"{APP_NAME}.log"
 
+# Screenshot requests closer together than this (seconds) share one capture
+SCREENSHOT_CACHE_TTL = 0.05
+
+# How long (seconds) UxPlay must stay up after launch to count as started
+UXPLAY_START_GRACE = 0.5
+
+# PrintWindow flag that includes DirectX/DWM-composited content (Windows 8.1+)
+PW_RENDERFULLCONTENT = 0x2
+
+# Input schema shared by all MCP tools (none take arguments); treat as read-only
+EMPTY_TOOL_SCHEMA = {"type": "object", "properties": {}, "required": []}
+
 # ensure the AppData folder exists up front:
 APPDATA_DIR.mkdir(parents=True, exist_ok=True)
 
 # ─── Logging Setup ────────────────────────────────────────────────────────────
 
+class _BufferedFileHandler(logging.FileHandler):
+    """FileHandler that leaves flushing to the queue listener"""
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+
+class _FlushingQueueListener(logging.handlers.QueueListener):
+    """Flushes the handlers each time the queue runs dry, so a burst of
+    records reaches the file in one write and nothing waits behind it"""
+    def handle(self, record: logging.LogRecord) -> None:
+        super().handle(record)
+        if self.queue.empty():
+            for handler in self.handlers:
+                handler.flush()
+
+_log_file_handler = _BufferedFileHandler(str(LOG_FILE), encoding="utf-8")
+
+# Callers only enqueue records; a listener thread does the file/console writes
+_log_queue = queue.SimpleQueue()
+_log_listener = _FlushingQueueListener(
+    _log_queue,
+    _log_file_handler,
+    logging.StreamHandler(sys.stdout),
+    respect_handler_level=True,
+)
+_log_listener.start()
+
+def _shutdown_logging() -> None:
+    """Drain queued records to the handlers and flush the log file"""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+    _log_file_handler.flush()
+
+atexit.register(_shutdown_logging)
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s [%(levelname)s] %(message)s",
-    handlers=[
-        logging.FileHandler(str(LOG_FILE), encoding="utf-8"),
-        logging.StreamHandler(sys.stdout),
-    ],
+    handlers=[logging.handlers.QueueHandler(_log_queue)],
 )
 
 # ─── Path Discovery ───────────────────────────────────────────────────────────
@@ -95,6 +168,8 @@ class Paths:
 class ArgumentManager:
     def __init__(self, file_path: Path):
         self.file_path = file_path
+        # (st_mtime_ns, parsed args) of the last read
+        self._cached: Optional[tuple[int, List[str]]] = None
 
     def ensure_exists(self) -> None:
         logging.info("Ensuring arguments file at '%s'", self.file_path)
@@ -104,17 +179,25 @@ class ArgumentManager:
             logging.info("Created empty arguments.txt")
 
     def read_args(self) -> List[str]:
-        if not self.file_path.exists():
+        try:
+            mtime = self.file_path.stat().st_mtime_ns
+        except FileNotFoundError:
             logging.warning("arguments.txt missing → no custom args")
+            self._cached = None
             return []
+        # Only re-read and re-parse when the file has been edited
+        if self._cached and self._cached[0] == mtime:
+            return list(self._cached[1])
+
         text = self.file_path.read_text(encoding="utf-8").strip()
-        if not text:
-            return []
-        try:
-            return shlex.split(text)
-        except ValueError as e:
-            logging.error("Could not parse arguments.txt: %s", e)
-            return []
+        args: List[str] = []
+        if text:
+            try:
+                args = shlex.split(text)
+            except ValueError as e:
+                logging.error("Could not parse arguments.txt: %s", e)
+        self._cached = (mtime, args)
+        return list(args)
 
 # ─── MCP Configuration Manager ────────────────────────────────────────────────
 
@@ -124,6 +207,11 @@ class MCPConfigManager:
         self.config_file = config_file
         self.default_host = "127.0.0.1"
         self.default_port = 8000
+        # (st_mtime_ns, (host, port)) of the last read; the file may also be
+        # edited by hand from the tray menu
+        self._cache: Optional[tuple[int, tuple[str, int]]] = None
+        # Why the current file was rejected, or None if it is valid/missing
+        self.error: Optional[str] = None
         
     def ensure_exists(self) -> None:
         """Ensure config file exists with defaults"""
@@ -134,20 +222,46 @@ class MCPConfigManager:
     def load_config(self) -> tuple[str, int]:
         """Load host and port from config file"""
         try:
-            if self.config_file.exists():
-                config = json.loads(self.config_file.read_text(encoding="utf-8"))
-                host = config.get("host", self.default_host)
-                port = config.get("port", self.default_port)
-                return host, port
+            mtime = self.config_file.stat().st_mtime_ns
+        except FileNotFoundError:
+            self.error = None
+            return self.default_host, self.default_port
+        except OSError as e:
+            logging.error("Failed to load MCP config: %s", e)
+            return self.default_host, self.default_port
+
+        # Only re-read and re-parse when the file has been edited; a rejected
+        # file is cached too, so its error is logged once per edit
+        if self._cache and self._cache[0] == mtime:
+            return self._cache[1]
+        try:
+            config = json.loads(self.config_file.read_text(encoding="utf-8"))
+            host = config.get("host", self.default_host)
+            port = config.get("port", self.default_port)
+            if not (isinstance(host, str) and host.strip()):
+                raise ValueError("host cannot be empty")
+            # bool is an int subclass; JSON true must not load as port 1
+            if not (isinstance(port, int) and not isinstance(port, bool) and 1 <= port <= 65535):
+                raise ValueError("port must be between 1 and 65535")
+            result = (host.strip(), port)
+            self.error = None
         except Exception as e:
             logging.error("Failed to load MCP config: %s", e)
-        return self.default_host, self.default_port
+            result = (self.default_host, self.default_port)
+            self.error = str(e)
+        self._cache = (mtime, result)
+        return result
     
     def save_config(self, host: str, port: int) -> None:
         """Save host and port to config file"""
         try:
             config = {"host": host, "port": port}
-            self.config_file.write_text(json.dumps(config, indent=2), encoding="utf-8")
+            # Write a sibling and swap it in so readers never see a partial file
+            tmp = self.config_file.with_suffix(".json.tmp")
+            tmp.write_text(json.dumps(config, indent=2), encoding="utf-8")
+            os.replace(tmp, self.config_file)
+            self._cache = (self.config_file.stat().st_mtime_ns, (host, port))
+            self.error = None
             logging.info("Saved MCP config: %s:%s", host, port)
         except Exception as e:
             logging.error("Failed to save MCP config: %s", e)
@@ -159,9 +273,21 @@ class ServerManager:
         self.exe_path = exe_path
         self.arg_mgr = arg_mgr
         self.process: Optional[subprocess.Popen] = None
+        # Set on start, cleared by the reaper thread the moment UxPlay exits
+        self._alive = False
+
+    def is_alive(self) -> bool:
+        """Whether UxPlay is running, without polling the process"""
+        return self._alive
+
+    def _reap(self, process: subprocess.Popen) -> None:
+        """Block until UxPlay exits, then mark it stopped"""
+        process.wait()
+        if self.process is process:
+            self._alive = False
 
     def start(self) -> None:
-        if self.process and self.process.poll() is None:
+        if self.is_alive():
             logging.info("UxPlay server already running (PID %s)", self.process.pid)
             return
 
@@ -171,17 +297,25 @@ class ServerManager:
 
         cmd = [str(self.exe_path)] + self.arg_mgr.read_args()
         logging.info("Starting UxPlay: %s", cmd)
+        # Give the child no std handles, so it doesn't inherit ours (or the
+        # MCP server's sockets)
         try:
             self.process = subprocess.Popen(
                 cmd,
-                creationflags=subprocess.CREATE_NO_WINDOW
+                creationflags=subprocess.CREATE_NO_WINDOW,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                close_fds=True
             )
             logging.info("Started UxPlay (PID %s)", self.process.pid)
+            self._alive = True
+            threading.Thread(target=self._reap, args=(self.process,), daemon=True).start()
         except Exception:
             logging.exception("Failed to launch UxPlay")
 
     def stop(self) -> None:
-        if not (self.process and self.process.poll() is None):
+        if not self.is_alive():
             logging.info("UxPlay server not running.")
             return
 
@@ -199,6 +333,7 @@ class ServerManager:
             logging.exception("Error stopping UxPlay")
         finally:
             self.process = None
+            self._alive = False
 
 # ─── Enhanced Server Manager with Frame Capture ───────────────────────────────
 
@@ -209,36 +344,187 @@ class EnhancedServerManager(ServerManager):
     """
     def __init__(self, exe_path: Path, arg_mgr: ArgumentManager):
         super().__init__(exe_path, arg_mgr)
+        # Frames are kept in memory; only written here with persist=True
         self.frame_dir = Path(tempfile.gettempdir()) / "uxplay_frames"
-        self.frame_dir.mkdir(parents=True, exist_ok=True)
         self.latest_frame = self.frame_dir / "latest_frame.png"
+        self.latest_png: Optional[bytes] = None
+        # DXcam camera, created on first capture (False if unavailable)
+        self._dxcam = None
+        self._last_image: Optional[Image.Image] = None
+        self._last_region = None
+        # (size, pixel hash) of latest_png, and a version bumped per new PNG
+        self._last_raw_key: Optional[tuple[tuple[int, int], int]] = None
+        self.frame_version = 0
+        # (frame_version, PNG) published as one pair for /frame.png?v=
+        self.versioned_png: Optional[tuple[int, bytes]] = None
+        # (width, height) of latest_png, so callers never reopen the PNG
+        self.frame_size = (0, 0)
+        # UxPlay window handle, looked up once and revalidated per capture
+        self._hwnd: Optional[int] = None
+
+    def stop(self) -> None:
+        super().stop()
+        # The window goes away with the process; look it up again next time
+        self._hwnd = None
+
+    def _get_dxcam(self):
+        """Return the DXcam camera, creating it on first use"""
+        if self._dxcam is None:
+            try:
+                import dxcam
+                self._dxcam = dxcam.create(output_color="BGRA")
+            except Exception as e:
+                logging.info("DXcam not available (%s), using MSS for capture", e)
+                self._dxcam = False
+        return self._dxcam or None
 
-    def capture_frame(self) -> Optional[Path]:
+    def _print_window(self, hwnd: int):
         """
-        Capture a frame from the UxPlay window.
-        Returns path to captured frame or None if failed.
+        Render the window into a bitmap with PrintWindow, which also works
+        when it is covered by other windows.
+        Returns (image, raw pixel buffer) or None if it failed.
         """
+        import ctypes
+        import win32gui
+        import win32ui
+
+        left, top, right, bottom = win32gui.GetWindowRect(hwnd)
+        width, height = right - left, bottom - top
+        if width <= 0 or height <= 0:
+            return None
+
+        hwnd_dc = win32gui.GetWindowDC(hwnd)
+        src_dc = win32ui.CreateDCFromHandle(hwnd_dc)
+        mem_dc = src_dc.CreateCompatibleDC()
+        bitmap = win32ui.CreateBitmap()
+        previous = None
         try:
+            bitmap.CreateCompatibleBitmap(src_dc, width, height)
+            previous = mem_dc.SelectObject(bitmap)
+            if not ctypes.windll.user32.PrintWindow(hwnd, mem_dc.GetSafeHdc(), PW_RENDERFULLCONTENT):
+                return None
+            bits = bitmap.GetBitmapBits(True)
+        finally:
+            # DeleteObject fails on a bitmap still selected into a DC
+            if previous is not None:
+                mem_dc.SelectObject(previous)
+            mem_dc.DeleteDC()
+            win32gui.DeleteObject(bitmap.GetHandle())
+            src_dc.DeleteDC()
+            win32gui.ReleaseDC(hwnd, hwnd_dc)
+
+        # Frames from other backends invalidate the DXcam "unchanged" shortcut
+        self._last_image = None
+        return Image.frombuffer("RGB", (width, height), bits, "raw", "BGRX", 0, 1), bits
+
+    def _grab(self, bbox: Optional[tuple[int, int, int, int]] = None):
+        """
+        Grab a screen region (or the whole desktop if bbox is None).
+        Uses DXcam (Desktop Duplication) when available, else MSS, else ImageGrab.
+        Returns (image, raw pixel buffer) or None if no frame is available.
+        The raw buffer is None when DXcam reports the screen has not changed
+        since the previous grab of the same region.
+        """
+        camera = self._get_dxcam()
+        # DXcam only sees its own output; a window reaching past it (another
+        # monitor, partly offscreen) goes to MSS rather than being cropped
+        if camera is not None and (bbox is None or (
+                0 <= bbox[0] < bbox[2] <= camera.width
+                and 0 <= bbox[1] < bbox[3] <= camera.height)):
+            frame = camera.grab(region=bbox)
+            if frame is not None:
+                height, width = frame.shape[:2]
+                # Regions are column slices of the full output, i.e. strided
+                # views; copy them out once for both the image and the hash
+                raw = frame.tobytes()
+                self._last_image = Image.frombuffer("RGB", (width, height), raw, "raw", "BGRX", 0, 1)
+                self._last_region = bbox
+                return self._last_image, raw
+            # Desktop Duplication only returns a frame when the screen changed
+            if self._last_image is not None and self._last_region == bbox:
+                return self._last_image, None
+
+        # Frames from other backends invalidate the DXcam "unchanged" shortcut
+        self._last_image = None
+
+        try:
+            import mss
+        except ImportError:
             from PIL import ImageGrab
+            image = ImageGrab.grab(bbox=bbox)
+            return image, image.tobytes()
+
+        with mss.mss() as sct:
+            if bbox is None:
+                monitor = sct.monitors[0]
+            else:
+                x, y, x2, y2 = bbox
+                monitor = {"left": x, "top": y, "width": x2 - x, "height": y2 - y}
+            shot = sct.grab(monitor)
+        return Image.frombytes("RGB", shot.size, shot.bgra, "raw", "BGRX"), shot.raw
+
+    def _encode_frame(self, screenshot: Image.Image, raw) -> bytes:
+        """
+        Encode a frame as PNG into latest_png.
+        Skipped when the pixels are identical to the previous frame, or when
+        raw is None (the capture backend saw no new frame).
+        """
+        if raw is not None:
+            # Same bytes in a different shape (e.g. a rotated black frame)
+            # is a different frame
+            raw_key = (screenshot.size, _frame_hash(raw))
+            if raw_key == self._last_raw_key and self.latest_png is not None:
+                return self.latest_png
+            self._last_raw_key = raw_key
+        elif self.latest_png is not None:
+            return self.latest_png
+
+        buf = io.BytesIO()
+        # Low compression: deflate dominates encode time and the PNG is
+        # base64'd for transport anyway
+        screenshot.save(buf, format='PNG', compress_level=1)
+        self.latest_png = buf.getvalue()
+        self.frame_version += 1
+        self.versioned_png = (self.frame_version, self.latest_png)
+        self.frame_size = screenshot.size
+        return self.latest_png
+
+    def _store_frame(self, grabbed, persist: bool) -> bytes:
+        """Encode a grabbed frame and, if persist is set, also write it to latest_frame"""
+        png = self._encode_frame(*grabbed)
+        if persist:
+            self.frame_dir.mkdir(parents=True, exist_ok=True)
+            self.latest_frame.write_bytes(png)
+            logging.debug("Captured frame to %s", self.latest_frame)
+        return png
+
+    def capture_frame(self, persist: bool = False) -> Optional[bytes]:
+        """
+        Capture a frame from the UxPlay window.
+        Returns the frame as PNG bytes or None if failed. With persist=True
+        the PNG is also written to latest_frame (useful for debugging).
+        """
+        try:
             import win32gui
             
-            # Find the UxPlay window
-            hwnd = win32gui.FindWindow(None, "UxPlay")
-            if not hwnd:
-                hwnd = win32gui.FindWindow(None, "uxplay")
+            # Find the UxPlay window, reusing the cached handle while it is valid
+            hwnd = self._hwnd
+            if not (hwnd and win32gui.IsWindow(hwnd)):
+                hwnd = win32gui.FindWindow(None, "UxPlay")
+                if not hwnd:
+                    hwnd = win32gui.FindWindow(None, "uxplay")
+                self._hwnd = hwnd or None
             
-            if hwnd and win32gui.IsWindow(hwnd):
-                # Get window rectangle
-                rect = win32gui.GetWindowRect(hwnd)
-                x, y, x2, y2 = rect
-                
-                # Capture the window
-                screenshot = ImageGrab.grab(bbox=(x, y, x2, y2))
+            if hwnd:
+                # Render the window itself; fall back to grabbing its screen area
+                grabbed = self._print_window(hwnd)
+                if grabbed is None:
+                    grabbed = self._grab(win32gui.GetWindowRect(hwnd))
+                if grabbed is None:
+                    logging.warning("No frame available from screen capture")
+                    return None
                 
-                # Save to file
-                screenshot.save(str(self.latest_frame), format='PNG')
-                logging.info("Captured frame to %s", self.latest_frame)
-                return self.latest_frame
+                return self._store_frame(grabbed, persist)
             else:
                 logging.warning("UxPlay window not found")
                 return None
@@ -247,10 +533,11 @@ class EnhancedServerManager(ServerManager):
             logging.warning("Required packages not available (%s), falling back to full screen capture", e)
             # Fallback: capture full screen
             try:
-                from PIL import ImageGrab
-                screenshot = ImageGrab.grab()
-                screenshot.save(str(self.latest_frame), format='PNG')
-                return self.latest_frame
+                grabbed = self._grab()
+                if grabbed is None:
+                    logging.warning("No frame available from screen capture")
+                    return None
+                return self._store_frame(grabbed, persist)
             except ImportError:
                 logging.error("PIL not available, cannot capture screenshot")
                 return None
@@ -270,14 +557,12 @@ class AutoStartManager:
         self.app_name = app_name
         self.exe_cmd = exe_cmd
 
+    def _open(self, access: int):
+        return winreg.OpenKey(winreg.HKEY_CURRENT_USER, self.RUN_KEY, 0, access)
+
     def is_enabled(self) -> bool:
         try:
-            with winreg.OpenKey(
-                winreg.HKEY_CURRENT_USER,
-                self.RUN_KEY,
-                0,
-                winreg.KEY_READ
-            ) as key:
+            with self._open(winreg.KEY_READ) as key:
                 val, _ = winreg.QueryValueEx(key, self.app_name)
                 return self.exe_cmd in val
         except FileNotFoundError:
@@ -288,12 +573,7 @@ class AutoStartManager:
 
     def enable(self) -> None:
         try:
-            with winreg.OpenKey(
-                winreg.HKEY_CURRENT_USER,
-                self.RUN_KEY,
-                0,
-                winreg.KEY_SET_VALUE
-            ) as key:
+            with self._open(winreg.KEY_SET_VALUE) as key:
                 winreg.SetValueEx(
                     key,
                     self.app_name,
@@ -307,12 +587,7 @@ class AutoStartManager:
 
     def disable(self) -> None:
         try:
-            with winreg.OpenKey(
-                winreg.HKEY_CURRENT_USER,
-                self.RUN_KEY,
-                0,
-                winreg.KEY_SET_VALUE
-            ) as key:
+            with self._open(winreg.KEY_SET_VALUE) as key:
                 winreg.DeleteValue(key, self.app_name)
             logging.info("Autostart disabled")
         except FileNotFoundError:
@@ -321,13 +596,51 @@ class AutoStartManager:
             logging.exception("Failed to disable Autostart")
 
     def toggle(self) -> None:
-        if self.is_enabled():
-            self.disable()
-        else:
-            self.enable()
+        # Check and update through one handle
+        try:
+            with self._open(winreg.KEY_READ | winreg.KEY_SET_VALUE) as key:
+                try:
+                    val, _ = winreg.QueryValueEx(key, self.app_name)
+                    enabled = self.exe_cmd in val
+                except FileNotFoundError:
+                    enabled = False
+
+                if enabled:
+                    winreg.DeleteValue(key, self.app_name)
+                else:
+                    winreg.SetValueEx(
+                        key,
+                        self.app_name,
+                        0,
+                        winreg.REG_SZ,
+                        self.exe_cmd
+                    )
+            logging.info("Autostart %s", "disabled" if enabled else "enabled")
+        except Exception:
+            logging.exception("Failed to toggle Autostart")
 
 # ─── MCP Server Manager ───────────────────────────────────────────────────────
 
+def _new_event_loop() -> asyncio.AbstractEventLoop:
+    """Create an event loop, preferring libuv-based winloop/uvloop when installed"""
+    try:
+        if sys.platform == "win32":
+            import winloop as uvloop
+        else:
+            import uvloop
+    except ImportError:
+        return asyncio.new_event_loop()
+    return uvloop.new_event_loop()
+
+def _reachable_host(host: str) -> str:
+    """Turn a wildcard bind address into one other machines can connect to"""
+    if host != "0.0.0.0":
+        return host
+    try:
+        return socket.gethostbyname(socket.gethostname())
+    except OSError:
+        return "127.0.0.1"
+
 class MCPServerManager:
     """Manages the MCP HTTP server lifecycle"""
     def __init__(self, server_mgr: EnhancedServerManager, mcp_config: MCPConfigManager):
@@ -337,96 +650,171 @@ class MCPServerManager:
         self.mcp_config = mcp_config
         self.mcp_server_instance = None
         self.sse = None
+        self._init_opts = None
+        # (host, port) the running server was started with; the config file
+        # may have been edited since
+        self._bound: Optional[tuple[str, int]] = None
         self.app = None
         self.server_thread: Optional[threading.Thread] = None
         self.uvicorn_server = None
+        # Single worker so concurrent screenshot requests don't race for the screen
+        self._capture_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="uxplay-capture")
+        # Last encoded screenshot: (frame_version, (base64, width, height))
+        self._last_encoded: Optional[tuple[int, tuple[str, int, int]]] = None
+        self._last_grab_ts = 0.0
+        
+        # Tool handlers and definitions are static and built once; the Tool
+        # list needs the MCP imports, so it's built on first server creation
+        self._dispatch = {
+            "get_screenshot": self._handle_screenshot,
+            "get_screenshot_url": self._handle_screenshot_url,
+            "start_uxplay": self._handle_start_uxplay,
+            "stop_uxplay": self._handle_stop_uxplay,
+            "get_uxplay_status": self._handle_get_status,
+        }
+        self._tools: Optional[list[Tool]] = None
         
     def _create_mcp_server(self):
         """Create the MCP server instance with tools"""
         if not MCP_AVAILABLE:
             raise RuntimeError("MCP dependencies not available")
+        _import_mcp()
         
-        mcp_server = Server("uxplay-mcp-server")
-        
-        @mcp_server.list_tools()
-        async def list_tools() -> list[Tool]:
-            return [
+        if self._tools is None:
+            self._tools = [
                 Tool(
                     name="get_screenshot",
                     description="Capture a screenshot from the actual AirPlay video stream",
-                    inputSchema={"type": "object", "properties": {}, "required": []}
+                    inputSchema=EMPTY_TOOL_SCHEMA
+                ),
+                Tool(
+                    name="get_screenshot_url",
+                    description="Capture a screenshot from the AirPlay video stream and return a URL to download it as PNG",
+                    inputSchema=EMPTY_TOOL_SCHEMA
                 ),
                 Tool(
                     name="start_uxplay",
                     description="Start the UxPlay AirPlay server",
-                    inputSchema={"type": "object", "properties": {}, "required": []}
+                    inputSchema=EMPTY_TOOL_SCHEMA
                 ),
                 Tool(
                     name="stop_uxplay",
                     description="Stop the UxPlay AirPlay server",
-                    inputSchema={"type": "object", "properties": {}, "required": []}
+                    inputSchema=EMPTY_TOOL_SCHEMA
                 ),
                 Tool(
                     name="get_uxplay_status",
                     description="Get the current status of the UxPlay server",
-                    inputSchema={"type": "object", "properties": {}, "required": []}
+                    inputSchema=EMPTY_TOOL_SCHEMA
                 )
             ]
         
+        mcp_server = Server("uxplay-mcp-server")
+        
+        @mcp_server.list_tools()
+        async def list_tools() -> list[Tool]:
+            return self._tools
+        
         @mcp_server.call_tool()
         async def call_tool(name: str, arguments: dict) -> list[TextContent | ImageContent | EmbeddedResource]:
-            if name == "get_screenshot":
-                return await self._handle_screenshot()
-            elif name == "start_uxplay":
-                return await self._handle_start_uxplay()
-            elif name == "stop_uxplay":
-                return await self._handle_stop_uxplay()
-            elif name == "get_uxplay_status":
-                return await self._handle_get_status()
-            else:
+            handler = self._dispatch.get(name)
+            if handler is None:
                 raise ValueError(f"Unknown tool: {name}")
+            return await handler()
         
         return mcp_server
     
     async def _handle_screenshot(self) -> list[TextContent | ImageContent]:
         """Capture screenshot from AirPlay stream"""
         try:
-            if not (self.server_mgr.process and self.server_mgr.process.poll() is None):
+            if not self.server_mgr.is_alive():
                 return [TextContent(type="text", text="Error: UxPlay is not running.")]
             
-            frame_path = self.server_mgr.capture_frame()
-            if not frame_path or not frame_path.exists():
+            # Grab and encode on the capture thread so the event loop keeps
+            # serving other requests and SSE keepalives
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._capture_executor, self._capture_and_encode)
+            if result is None:
                 return [TextContent(type="text", text="Error: Failed to capture frame from UxPlay stream.")]
+            img_base64, width, height = result
+
+            return [
+                ImageContent(type="image", data=img_base64, mimeType="image/png"),
+                TextContent(type="text", text=f"AirPlay screenshot captured. Size: {width}x{height} pixels")
+            ]
+        except Exception as e:
+            logging.exception("Failed to capture screenshot")
+            return [TextContent(type="text", text=f"Error: {str(e)}")]
+
+    async def _handle_screenshot_url(self) -> list[TextContent]:
+        """Capture screenshot and return its /frame.png URL instead of inline base64"""
+        try:
+            if not self.server_mgr.is_alive():
+                return [TextContent(type="text", text="Error: UxPlay is not running.")]
             
-            with Image.open(frame_path) as img:
-                img_buffer = io.BytesIO()
-                img.save(img_buffer, format='PNG')
-                img_bytes = img_buffer.getvalue()
-                img_base64 = base64.b64encode(img_bytes).decode('utf-8')
-                
-                return [
-                    ImageContent(type="image", data=img_base64, mimeType="image/png"),
-                    TextContent(type="text", text=f"AirPlay screenshot captured. Size: {img.size[0]}x{img.size[1]} pixels")
-                ]
+            loop = asyncio.get_running_loop()
+            png = await loop.run_in_executor(self._capture_executor, self.server_mgr.capture_frame)
+            if png is None:
+                return [TextContent(type="text", text="Error: Failed to capture frame from UxPlay stream.")]
+            version, _ = self.server_mgr.versioned_png
+            width, height = self.server_mgr.frame_size
+            
+            host, port = self._bound
+            host = await asyncio.to_thread(_reachable_host, host)
+            url = f"http://{host}:{port}/frame.png?v={version}"
+            return [TextContent(type="text", text=f"AirPlay screenshot captured. Size: {width}x{height} pixels. PNG: {url}")]
         except Exception as e:
             logging.exception("Failed to capture screenshot")
             return [TextContent(type="text", text=f"Error: {str(e)}")]
+
+    def _capture_and_encode(self) -> Optional[tuple[str, int, int]]:
+        """
+        Capture a frame and return (base64 PNG, width, height), or None if failed.
+        Blocking; runs on the capture executor.
+        """
+        # Requests arriving faster than the stream can change reuse the last result
+        now = time.monotonic()
+        if self._last_encoded is not None and now - self._last_grab_ts < SCREENSHOT_CACHE_TTL:
+            return self._last_encoded[1]
+        self._last_grab_ts = now
+
+        png = self.server_mgr.capture_frame()
+        if png is None:
+            return None
+
+        # Unchanged pixels: capture_frame returned the previous PNG, reuse its encoding
+        version = self.server_mgr.frame_version
+        if self._last_encoded is not None and self._last_encoded[0] == version:
+            return self._last_encoded[1]
+
+        width, height = self.server_mgr.frame_size
+        result = (_b64encode(png), width, height)
+        self._last_encoded = (version, result)
+        return result
     
     async def _handle_start_uxplay(self) -> list[TextContent]:
         """Start UxPlay server"""
         try:
-            self.server_mgr.start()
-            await asyncio.sleep(1)
-            if self.server_mgr.process and self.server_mgr.process.poll() is None:
-                return [TextContent(type="text", text=f"UxPlay started (PID: {self.server_mgr.process.pid})")]
-            return [TextContent(type="text", text="UxPlay start command sent")]
+            if self.server_mgr.is_alive():
+                return [TextContent(type="text", text=f"UxPlay already running (PID: {self.server_mgr.process.pid})")]
+            await asyncio.to_thread(self.server_mgr.start)
+            if not self.server_mgr.is_alive():
+                return [TextContent(type="text", text="Failed to start UxPlay (see log)")]
+            # UxPlay has no ready signal (its window only appears once a device
+            # mirrors), so count surviving a short grace period as started
+            process = self.server_mgr.process
+            try:
+                await asyncio.to_thread(process.wait, UXPLAY_START_GRACE)
+            except subprocess.TimeoutExpired:
+                return [TextContent(type="text", text=f"UxPlay started (PID: {process.pid})")]
+            return [TextContent(type="text", text=f"UxPlay exited during startup (code {process.returncode})")]
         except Exception as e:
             return [TextContent(type="text", text=f"Error: {str(e)}")]
     
     async def _handle_stop_uxplay(self) -> list[TextContent]:
         """Stop UxPlay server"""
         try:
-            self.server_mgr.stop()
+            await asyncio.to_thread(self.server_mgr.stop)
             return [TextContent(type="text", text="UxPlay stopped")]
         except Exception as e:
             return [TextContent(type="text", text=f"Error: {str(e)}")]
@@ -434,7 +822,7 @@ class MCPServerManager:
     async def _handle_get_status(self) -> list[TextContent]:
         """Get UxPlay server status"""
         try:
-            is_running = self.server_mgr.process and self.server_mgr.process.poll() is None
+            is_running = self.server_mgr.is_alive()
             status = f"Running (PID: {self.server_mgr.process.pid})" if is_running else "Stopped"
             return [TextContent(type="text", text=f"UxPlay status: {status}")]
         except Exception as e:
@@ -450,37 +838,59 @@ class MCPServerManager:
             logging.info("MCP server already running")
             return
         
+        try:
+            _import_mcp()
+        except ImportError as e:
+            logging.error("Cannot start MCP server: %s", e)
+            return
+        
         host, port = self.mcp_config.load_config()
+        self._bound = (host, port)
         
         # Create MCP server and app
         self.mcp_server_instance = self._create_mcp_server()
+        self._init_opts = self.mcp_server_instance.create_initialization_options()
         self.sse = SseServerTransport("/messages")
         
         async def handle_sse(scope, receive, send):
             async with self.sse.connect_sse(scope, receive, send) as streams:
                 await self.mcp_server_instance.run(
-                    streams[0], streams[1],
-                    self.mcp_server_instance.create_initialization_options()
+                    streams[0], streams[1], self._init_opts
                 )
         
         async def handle_messages(scope, receive, send):
             await self.sse.handle_post_message(scope, receive, send)
         
+        async def serve_frame(request):
+            # Raw PNG of the last capture, so clients can skip base64-in-JSON.
+            # Only the latest frame is kept: ?v= for an older one is a 404
+            frame = self.server_mgr.versioned_png
+            version = request.query_params.get("v")
+            if frame is None or (version is not None and version != str(frame[0])):
+                return Response(status_code=404)
+            return Response(frame[1], media_type="image/png", headers={"Cache-Control": "no-store"})
+        
         self.app = Starlette(
             debug=False,
             routes=[
                 Route("/sse", endpoint=handle_sse),
                 Route("/messages", endpoint=handle_messages, methods=["POST"]),
+                Route("/frame.png", endpoint=serve_frame),
             ],
         )
         
         # Run server in thread with proper event loop handling
         def run_server():
             # Create new event loop for this thread
-            loop = asyncio.new_event_loop()
+            loop = _new_event_loop()
             asyncio.set_event_loop(loop)
+            logging.info("MCP server using %s event loop", type(loop).__module__)
             try:
-                config = uvicorn.Config(self.app, host=host, port=port, log_level="warning")
+                # uvicorn picks httptools automatically when it is installed
+                config = uvicorn.Config(
+                    self.app, host=host, port=port, log_level="warning",
+                    interface="asgi3", access_log=False
+                )
                 self.uvicorn_server = uvicorn.Server(config)
                 loop.run_until_complete(self.uvicorn_server.serve())
             finally:
@@ -503,18 +913,13 @@ class MCPServerManager:
         """Check if MCP server is running"""
         return self.server_thread and self.server_thread.is_alive()
     
-    def get_url(self) -> str:
-        """Get the MCP server URL"""
-        host, port = self.mcp_config.load_config()
-        return f"http://{host}:{port}/sse"
-    
     def get_config_json(self) -> str:
         """Get the MCP client configuration JSON"""
-        url = self.get_url()
+        host, port = self.mcp_config.load_config()
         config = {
             "mcpServers": {
                 "uxplay": {
-                    "url": url
+                    "url": f"http://{host}:{port}/sse"
                 }
             }
         }
@@ -566,10 +971,7 @@ class TrayIcon:
             ),
             pystray.MenuItem(
                 "License",
-                lambda _: webbrowser.open(
-                    "https://github.com/leapbtw/uxplay-windows/blob/"
-                    "main/LICENSE.md"
-                )
+                lambda _: self._open_license()
             ),
             pystray.MenuItem("Exit", lambda _: self._exit())
         ])
@@ -591,99 +993,76 @@ class TrayIcon:
     def _start_mcp(self):
         logging.info("Starting MCP server")
         self.mcp_mgr.start()
+        config = self.mcp_mgr.mcp_config
+        if config.error:
+            import ctypes
+            host, port = config.load_config()
+            ctypes.windll.user32.MessageBoxW(
+                0,
+                f"mcp_config.json is invalid: {config.error}\n\n"
+                f"The MCP server is using the defaults ({host}:{port}). "
+                "Fix the file from MCP Settings and restart the MCP server.",
+                "MCP Server Settings",
+                0x30  # MB_OK | MB_ICONWARNING
+            )
     
     def _stop_mcp(self):
         logging.info("Stopping MCP server")
         self.mcp_mgr.stop()
     
     def _show_mcp_settings(self):
-        """Show MCP settings dialog"""
+        """Show the MCP client configuration in a native message box"""
+        import ctypes
+        config_json = self.mcp_mgr.get_config_json()
         try:
-            import tkinter as tk
-            from tkinter import messagebox, scrolledtext
-        except ImportError:
-            logging.error("tkinter not available, cannot show MCP settings dialog")
-            # Try to show error using Windows message box
-            try:
-                import ctypes
-                ctypes.windll.user32.MessageBoxW(
-                    0,
-                    "tkinter is not available. MCP settings dialog cannot be opened.\n\n"
-                    "MCP configuration is stored in:\n"
-                    f"{self.mcp_mgr.mcp_config.config_file}\n\n"
-                    "Edit this file manually to configure host and port.",
-                    "MCP Settings - Error",
-                    0x10  # MB_ICONERROR
-                )
-            except Exception:
-                logging.exception("Failed to show error dialog")
+            choice = ctypes.windll.user32.MessageBoxW(
+                0,
+                "MCP Client Configuration (copy this to your MCP client):\n\n"
+                f"{config_json}\n\n"
+                "Yes: copy the configuration to the clipboard\n"
+                "No: edit host and port in mcp_config.json\n"
+                "(restart the MCP server for changes to take effect)",
+                "MCP Server Settings",
+                0x03 | 0x40  # MB_YESNOCANCEL | MB_ICONINFORMATION
+            )
+        except Exception:
+            logging.exception("Failed to show MCP settings")
             return
-        
+
+        if choice == 6:  # IDYES
+            self._copy_to_clipboard(config_json)
+        elif choice == 7:  # IDNO
+            self._open_mcp_config()
+
+    def _copy_to_clipboard(self, text: str):
         try:
-            # Create settings window
-            window = tk.Tk()
-            window.title("MCP Server Settings")
-            window.geometry("500x400")
-            window.resizable(False, False)
-            
-            # Load current config
-            host, port = self.mcp_mgr.mcp_config.load_config()
-            
-            # Host setting
-            tk.Label(window, text="MCP Server Host:", font=("Arial", 10, "bold")).pack(pady=(10, 5))
-            host_var = tk.StringVar(value=host)
-            host_entry = tk.Entry(window, textvariable=host_var, width=40)
-            host_entry.pack(pady=5)
-            
-            # Port setting
-            tk.Label(window, text="MCP Server Port:", font=("Arial", 10, "bold")).pack(pady=(10, 5))
-            port_var = tk.StringVar(value=str(port))
-            port_entry = tk.Entry(window, textvariable=port_var, width=40)
-            port_entry.pack(pady=5)
-            
-            # Save button
-            def save_settings():
-                try:
-                    new_host = host_var.get().strip()
-                    new_port = int(port_var.get().strip())
-                    
-                    if not new_host:
-                        messagebox.showerror("Error", "Host cannot be empty")
-                        return
-                    if new_port < 1 or new_port > 65535:
-                        messagebox.showerror("Error", "Port must be between 1 and 65535")
-                        return
-                    
-                    self.mcp_mgr.mcp_config.save_config(new_host, new_port)
-                    
-                    # Update JSON display
-                    json_text.delete(1.0, tk.END)
-                    json_text.insert(1.0, self.mcp_mgr.get_config_json())
-                    
-                    messagebox.showinfo("Success", "Settings saved! Restart MCP server for changes to take effect.")
-                except ValueError:
-                    messagebox.showerror("Error", "Port must be a valid number")
-            
-            tk.Button(window, text="Save Settings", command=save_settings, bg="#4CAF50", fg="white", font=("Arial", 10, "bold")).pack(pady=10)
-            
-            # Configuration JSON display
-            tk.Label(window, text="MCP Client Configuration (copy this to your MCP client):", font=("Arial", 10, "bold")).pack(pady=(10, 5))
-            json_text = scrolledtext.ScrolledText(window, width=55, height=8, font=("Courier", 9))
-            json_text.pack(pady=5, padx=10)
-            json_text.insert(1.0, self.mcp_mgr.get_config_json())
-            
-            # Copy button
-            def copy_to_clipboard():
-                window.clipboard_clear()
-                window.clipboard_append(json_text.get(1.0, tk.END).strip())
-                messagebox.showinfo("Copied", "Configuration copied to clipboard!")
-            
-            tk.Button(window, text="Copy to Clipboard", command=copy_to_clipboard, bg="#2196F3", fg="white").pack(pady=5)
-            
-            window.mainloop()
-            
-        except Exception as e:
-            logging.exception("Failed to show MCP settings")
+            import win32clipboard
+            win32clipboard.OpenClipboard()
+            try:
+                win32clipboard.EmptyClipboard()
+                win32clipboard.SetClipboardData(win32clipboard.CF_UNICODETEXT, text)
+            finally:
+                win32clipboard.CloseClipboard()
+            logging.info("Copied MCP configuration to clipboard")
+        except Exception:
+            logging.exception("Failed to copy MCP configuration to clipboard")
+
+    def _open_mcp_config(self):
+        config = self.mcp_mgr.mcp_config
+        config.ensure_exists()
+        try:
+            # Not os.startfile: many Windows installs have no .json association
+            subprocess.Popen(["notepad.exe", str(config.config_file)])
+            logging.info("Opened mcp_config.json")
+        except Exception:
+            logging.exception("Failed to open mcp_config.json")
+
+    def _open_license(self):
+        import webbrowser
+        webbrowser.open(
+            "https://github.com/leapbtw/uxplay-windows/blob/"
+            "main/LICENSE.md"
+        )
 
     def _open_args(self):
         self.arg_mgr.ensure_exists()
@@ -699,8 +1078,16 @@ class TrayIcon:
         self.server_mgr.stop()
         self.icon.stop()
 
+    def _on_visible(self, icon):
+        # pystray runs this on its own thread once the icon is up, so the
+        # tray appears immediately and UxPlay starts right after
+        icon.visible = True
+        self.server_mgr.start()
+        # Optionally auto-start MCP server
+        # self.mcp_mgr.start()
+
     def run(self):
-        self.icon.run()
+        self.icon.run(setup=self._on_visible)
 
 # ─── Application Orchestration ───────────────────────────────────────────────
 
@@ -732,18 +1119,14 @@ class Application:
         self.arg_mgr.ensure_exists()
         self.mcp_config.ensure_exists()
 
-        # delay server start so the tray icon appears immediately
-        threading.Thread(target=self._delayed_start, daemon=True).start()
+        # Pillow-SIMD releases carry a .postN suffix
+        simd = " (SIMD build)" if ".post" in PIL.__version__ else ""
+        logging.info("Using Pillow %s%s", PIL.__version__, simd)
 
         logging.info("Launching tray icon")
         self.tray.run()
         logging.info("Tray exited – shutting down")
-
-    def _delayed_start(self):
-        time.sleep(3)
-        self.server_mgr.start()
-        # Optionally auto-start MCP server
-        # self.mcp_mgr.start()
+        _shutdown_logging()
 
 if __name__ == "__main__":
     Application().run()